@@ -0,0 +1,76 @@
+"""
+Preallocated PCM ring buffer for microphone capture.
+
+Capture writes raw frames in; the recognizer and the voice-activity check
+read them back as memoryview slices, so no per-utterance lists of frames
+are built and nothing is joined or copied on the way to recognition.
+
+The buffer is "mirrored": every byte is stored twice, at i and
+i + capacity. Any window of up to `capacity` bytes is therefore one
+contiguous slice, even when it wraps around the end of the ring.
+"""
+
+
+class PCMRingBuffer:
+    """
+    Fixed-size ring of raw PCM bytes addressed by absolute stream position.
+
+    Positions count every byte ever written, so a caller can remember where
+    an utterance started and ask for it later. Views are only valid until
+    the ring wraps over them (i.e. until `capacity` more bytes are written).
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._buf = bytearray(2 * capacity)  # allocated once, never grows
+        self._mv = memoryview(self._buf)
+        self.position = 0  # total bytes written so far
+
+    @property
+    def oldest(self) -> int:
+        """Oldest absolute position that can still be read."""
+        return max(0, self.position - self.capacity)
+
+    def clear(self) -> None:
+        """Forget everything written so far (the memory is kept)."""
+        self.position = 0
+
+    def write(self, chunk) -> None:
+        """Append a bytes-like chunk, overwriting the oldest data if full."""
+        data = memoryview(chunk).cast("B")
+        if len(data) > self.capacity:
+            # Only the newest `capacity` bytes can survive anyway
+            self.position += len(data) - self.capacity
+            data = data[-self.capacity:]
+
+        n = len(data)
+        cap = self.capacity
+        idx = self.position % cap
+        first = min(n, cap - idx)
+        rest = n - first
+
+        self._mv[idx:idx + first] = data[:first]
+        self._mv[idx + cap:idx + cap + first] = data[:first]
+        if rest:
+            self._mv[0:rest] = data[first:]
+            self._mv[cap:cap + rest] = data[first:]
+
+        self.position += n
+
+    def view(self, start: int, end: int = None) -> memoryview:
+        """Zero-copy view of absolute positions [start, end)."""
+        if end is None:
+            end = self.position
+        if not (self.oldest <= start <= end <= self.position):
+            raise ValueError(
+                f"range {start}-{end} is outside the buffered data "
+                f"({self.oldest}-{self.position})"
+            )
+        offset = start % self.capacity
+        return self._mv[offset:offset + (end - start)]
+
+    def last(self, nbytes: int) -> memoryview:
+        """Zero-copy view of the newest `nbytes` bytes (or fewer if not written yet)."""
+        return self.view(max(self.oldest, self.position - nbytes))
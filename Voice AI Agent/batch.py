@@ -0,0 +1,138 @@
+"""
+Headless batch runner for Anakin.
+
+Reads commands as JSONL (one utterance per line) from a file or stdin,
+runs them through main.handle_command() with TTS muted and writes one
+JSONL result per command with its timing.
+
+Input lines can be a JSON object with a "text" field (and an optional
+"id"), or just a JSON string:
+
+    {"id": "w1", "text": "what is the weather in bangalore"}
+    "wikipedia alan turing"
+
+Usage:
+    python batch.py commands.jsonl -o results.jsonl --workers 8
+    cat commands.jsonl | python batch.py > results.jsonl
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import main
+
+
+# -----------------------------
+# 1. Input parsing
+# -----------------------------
+def read_commands(lines):
+    """Parse JSONL lines into a list of {"id", "text"} dicts (blank lines skipped)."""
+    commands = []
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"Batch Error: line {line_no} is not valid JSON ({e})", file=sys.stderr)
+            continue
+
+        if isinstance(item, str):
+            item = {"text": item}
+        if not isinstance(item, dict) or not str(item.get("text", "")).strip():
+            print(f"Batch Error: line {line_no} has no command text", file=sys.stderr)
+            continue
+
+        commands.append({"id": item.get("id", line_no), "text": str(item["text"])})
+
+    return commands
+
+
+# -----------------------------
+# 2. Running commands
+# -----------------------------
+def run_command(command: dict) -> dict:
+    """Run one command through the shared handler and time it."""
+    start = time.perf_counter()
+    result = {"id": command["id"], "text": command["text"]}
+    try:
+        result["reply"] = main.handle_command(command["text"], interactive=False)
+    except Exception as e:
+        result["reply"] = ""
+        result["error"] = str(e)
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def run_batch(commands, out, workers: int = 4) -> dict:
+    """
+    Run all commands on a thread pool and write results to `out` in input order.
+
+    The commands are I/O bound (weather, Wikipedia, Groq), so threads let
+    independent lookups overlap. Returns a small summary dict.
+    """
+    main.VOICE_ENABLED = False  # headless: print only, never speak
+
+    start = time.perf_counter()
+    errors = 0
+    elapsed = []
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        # map() yields in submission order, so output lines match input lines
+        for result in pool.map(run_command, commands):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            elapsed.append(result["elapsed_ms"])
+            if "error" in result:
+                errors += 1
+
+    wall = time.perf_counter() - start
+    elapsed.sort()
+    return {
+        "commands": len(commands),
+        "errors": errors,
+        "wall_s": round(wall, 3),
+        "commands_per_s": round(len(commands) / wall, 2) if wall > 0 else 0.0,
+        "p50_ms": elapsed[len(elapsed) // 2] if elapsed else 0.0,
+        "max_ms": elapsed[-1] if elapsed else 0.0,
+        "local_answers": main.ANSWER_STATS["local"],
+        "local_share": round(main.ANSWER_STATS["local"] / len(commands), 3) if commands else 0.0,
+    }
+
+
+# -----------------------------
+# 3. Command-line entry point
+# -----------------------------
+def cli(argv=None):
+    parser = argparse.ArgumentParser(description="Run Anakin commands headlessly from JSONL.")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file with commands (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL file for results (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="number of worker threads (default: 4)")
+    args = parser.parse_args(argv)
+
+    if args.input == "-":
+        commands = read_commands(sys.stdin)
+    else:
+        with open(args.input, "r", encoding="utf-8") as f:
+            commands = read_commands(f)
+
+    if args.output == "-":
+        out = sys.stdout
+        # Keep stdout pure JSONL: the assistant's own prints go to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            summary = run_batch(commands, out, workers=args.workers)
+    else:
+        with open(args.output, "w", encoding="utf-8") as out:
+            summary = run_batch(commands, out, workers=args.workers)
+
+    print(f"Batch summary: {json.dumps(summary)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    cli()
@@ -1,5 +1,6 @@
 import os
 import time
+import threading
 import requests
 import wikipedia
 import speech_recognition as sr
@@ -7,10 +8,14 @@ import pyttsx3
 import webbrowser
 import datetime as dt
 import cv2
+import numpy as np
 import urllib.parse  #  for proper Google search encoding
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from audio_buffer import PCMRingBuffer
+from quick_answers import quick_answer
+
 
 # -----------------------------
 # 1. Load environment variables
@@ -77,6 +82,116 @@ def speak(text: str, force: bool = False) -> None:
 # -----------------------------
 recognizer = sr.Recognizer()
 
+LISTEN_TIMEOUT = 12         # max wait (seconds) for speech to START
+PHRASE_TIME_LIMIT = 18      # max length (seconds) of your entire question
+PRE_ROLL_SECONDS = 0.5      # audio kept from just before speech starts
+
+# One capture buffer for the whole session, so memory stays flat
+_capture_ring = None
+
+
+def _get_capture_ring(source) -> PCMRingBuffer:
+    """Return the shared ring buffer, (re)allocating only if the mic format changes."""
+    global _capture_ring
+
+    chunk_bytes = source.CHUNK * source.SAMPLE_WIDTH
+    seconds = PHRASE_TIME_LIMIT + PRE_ROLL_SECONDS
+    chunks = int(seconds * source.SAMPLE_RATE / source.CHUNK) + 2
+    capacity = chunks * chunk_bytes
+
+    if _capture_ring is None or _capture_ring.capacity != capacity:
+        _capture_ring = PCMRingBuffer(capacity)
+    _capture_ring.clear()
+    return _capture_ring
+
+
+def _rms(frames: memoryview, sample_width: int) -> float:
+    """Energy of a block of PCM frames, read in place (no copy)."""
+    samples = np.frombuffer(frames, dtype=f"<i{sample_width}")
+    if samples.size == 0:
+        return 0.0
+    return float(np.sqrt(np.mean(samples.astype(np.float64) ** 2)))
+
+
+def capture_phrase(source, timeout: float, phrase_time_limit: float) -> sr.AudioData:
+    """
+    Record one phrase into the shared ring buffer and hand it over as AudioData.
+
+    Works like recognizer.listen() (same energy / pause thresholds, including
+    the dynamic energy threshold), but the frames are written into a
+    preallocated buffer instead of a growing list, and the returned AudioData
+    wraps a view of that buffer without copying.
+    The audio is only valid until the next capture.
+    """
+    ring = _get_capture_ring(source)
+    width = source.SAMPLE_WIDTH
+    chunk_bytes = source.CHUNK * width
+    seconds_per_chunk = source.CHUNK / source.SAMPLE_RATE
+
+    pause_chunks = int(recognizer.pause_threshold / seconds_per_chunk)
+    phrase_chunks = int(recognizer.phrase_threshold / seconds_per_chunk)
+    trailing_chunks = int(recognizer.non_speaking_duration / seconds_per_chunk)
+    pre_roll_bytes = int(PRE_ROLL_SECONDS / seconds_per_chunk) * chunk_bytes
+    limit_chunks = int(phrase_time_limit / seconds_per_chunk)
+
+    waited = 0.0
+    stream_ended = False
+    while True:
+        # Wait for speech to start, keeping the ring filled for the pre-roll
+        while True:
+            if timeout and waited > timeout:
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+
+            chunk = source.stream.read(source.CHUNK)
+            if len(chunk) == 0:
+                # Stream closed: nothing more to record (same as recognizer.listen())
+                return sr.AudioData(ring.view(ring.position), source.SAMPLE_RATE, width)
+            ring.write(chunk)
+            waited += seconds_per_chunk
+
+            energy = _rms(ring.last(len(chunk)), width)
+            if energy > recognizer.energy_threshold:
+                break
+
+            # Follow changing background noise, like recognizer.listen() does
+            if recognizer.dynamic_energy_threshold:
+                damping = recognizer.dynamic_energy_adjustment_damping ** seconds_per_chunk
+                target_energy = energy * recognizer.dynamic_energy_ratio
+                recognizer.energy_threshold = (
+                    recognizer.energy_threshold * damping + target_energy * (1 - damping)
+                )
+
+        start = max(ring.oldest, ring.position - len(chunk) - pre_roll_bytes)
+
+        # Record until a long enough pause or the phrase time limit
+        speech_count = 1
+        pause_count = 0
+        total_chunks = 1
+        while total_chunks < limit_chunks:
+            chunk = source.stream.read(source.CHUNK)
+            if len(chunk) == 0:
+                stream_ended = True
+                break
+            ring.write(chunk)
+            total_chunks += 1
+
+            if _rms(ring.last(len(chunk)), width) > recognizer.energy_threshold:
+                speech_count += 1
+                pause_count = 0
+            else:
+                pause_count += 1
+                if pause_count > pause_chunks:
+                    break
+
+        # Too short to be speech (a click or a bump): go back to waiting
+        if stream_ended or speech_count >= phrase_chunks:
+            break
+        waited += total_chunks * seconds_per_chunk
+
+    # Drop trailing silence beyond what the recognizer expects to see
+    end = ring.position - max(0, pause_count - trailing_chunks) * chunk_bytes
+    return sr.AudioData(ring.view(start, end), source.SAMPLE_RATE, width)
+
 
 def listen() -> str:
     """Listen from microphone and return recognized text (lowercase)."""
@@ -89,12 +204,10 @@ def listen() -> str:
         # Allow natural pauses in long questions
         recognizer.pause_threshold = 2.0       # YOU CAN PAUSE 2 SECONDS
         recognizer.phrase_threshold = 0.1      # small bursts treated as part of speech
-        recognizer.non_speaking_duration = 0.5 # silence allowed before speech starts
+        recognizer.non_speaking_duration = 0.5 # silence kept at the end of a phrase
 
         try:
-            # timeout = max wait for speech to START
-            # phrase_time_limit = max length of your entire question
-            audio = recognizer.listen(source, timeout=12, phrase_time_limit=18)
+            audio = capture_phrase(source, timeout=LISTEN_TIMEOUT, phrase_time_limit=PHRASE_TIME_LIMIT)
         except sr.WaitTimeoutError:
             print("Listening timed out (no speech).")
             speak("I did not hear anything.")
@@ -357,7 +470,153 @@ def wishMe():
 
 
 # -----------------------------
-# 11. Main Assistant Loop (console / PyCharm)
+# 11. Shared command handler
+#    (console loop, Streamlit UI and batch runner)
+# -----------------------------
+# How many turns were answered locally (no network / LLM)
+ANSWER_STATS = {"turns": 0, "local": 0}
+_stats_lock = threading.Lock()  # batch runner calls handle_command from threads
+
+
+def local_answer_report() -> str:
+    """Summary like "Answered 3 of 10 turns locally (30%)."."""
+    with _stats_lock:
+        turns, local = ANSWER_STATS["turns"], ANSWER_STATS["local"]
+    share = (100 * local / turns) if turns else 0
+    return f"Answered {local} of {turns} turns locally ({share:.0f}%)."
+
+
+def handle_command(user_text: str, interactive: bool = True) -> str:
+    """
+    Process one command, speak the reply and return it.
+
+    interactive = False is used for headless runs: no follow-up questions
+    through the microphone, no browser tabs and no camera.
+    """
+    user_text = user_text.lower().strip()
+
+    # Quick local answers first: math, unit conversions, world clock
+    reply = quick_answer(user_text)
+    with _stats_lock:
+        ANSWER_STATS["turns"] += 1
+        if reply is not None:
+            ANSWER_STATS["local"] += 1
+    if reply is not None:
+        speak(reply)
+        return reply
+
+    # Time and date
+    if "time" in user_text:
+        reply = f"The time is {get_time_string()}."
+        speak(reply)
+        return reply
+
+    if "date" in user_text or "today's date" in user_text:
+        reply = f"Today is {get_date_string()}."
+        speak(reply)
+        return reply
+
+    # Open websites
+    sites = [
+        (("open google",), "Google", "https://www.google.com"),
+        (("open youtube",), "YouTube", "https://www.youtube.com"),
+        (("open stackoverflow", "open stack overflow"), "Stack Overflow", "https://stackoverflow.com"),
+    ]
+    for phrases, name, site_url in sites:
+        if any(phrase in user_text for phrase in phrases):
+            if not interactive:
+                reply = f"Would open {name} (skipped in batch mode)."
+                speak(reply)
+                return reply
+            reply = f"Opening {name}."
+            speak(reply)
+            webbrowser.open(site_url)
+            return reply
+
+    #  Google search with proper query
+    if "search google for" in user_text or "google" in user_text:
+        if "search google for" in user_text:
+            query = user_text.split("search google for", 1)[1].strip()
+        else:
+            parts = user_text.split("google", 1)
+            query = parts[1].strip() if len(parts) > 1 else ""
+
+        if not query and interactive:
+            speak("What should I search on Google?")
+            query = takeCommand()
+
+        if query and not interactive:
+            reply = f"Would search Google for {query} (skipped in batch mode)."
+            speak(reply)
+        elif query:
+            encoded = urllib.parse.quote_plus(query)
+            url = f"https://www.google.com/search?q={encoded}"
+            reply = f"Searching Google for {query}."
+            speak(reply)
+            webbrowser.open(url)
+        else:
+            reply = "I did not get the search term."
+            speak(reply)
+        return reply
+
+    # Weather
+    if "weather" in user_text:
+        location = None
+        if " in " in user_text:
+            location = user_text.split(" in ", 1)[1].strip()
+        if not location and interactive:
+            speak("Which location? You can say just a city or a state, like Bangalore or Karnataka.")
+            location = takeCommand()
+
+        if location:
+            reply = get_live_weather(location)
+        else:
+            reply = "I did not catch the location."
+        speak(reply)
+        return reply
+
+    # Wikipedia
+    if user_text.startswith("wikipedia") or user_text.startswith("wiki "):
+        topic = (
+            user_text.replace("wikipedia", "", 1)
+            .replace("wiki", "", 1)
+            .strip()
+        )
+        if not topic and interactive:
+            speak("What should I search on Wikipedia?")
+            topic = takeCommand()
+
+        if topic:
+            reply = get_wikipedia_summary(topic)
+        else:
+            reply = "I did not catch the topic."
+        speak(reply)
+        return reply
+
+    # Custom commands: notes, reminders, photos
+    # (these ask follow-up questions or use the camera, so they need a live session)
+    custom_commands = [
+        (("write a note", "take a note", "make a note"), write_note, "I have written your note."),
+        (("set a reminder", "remind me"), set_reminder, "I have saved your reminder."),
+        (("take a photo", "take a picture", "click a photo"), take_photo, "I have taken a photo using your camera."),
+    ]
+    for phrases, action, done_reply in custom_commands:
+        if any(phrase in user_text for phrase in phrases):
+            if not interactive:
+                reply = "This command needs the microphone or camera, so I skipped it."
+                speak(reply)
+                return reply
+            action()
+            return done_reply
+
+    # General Groq AI
+    reply = ask_groq(user_text)
+    speak(reply)
+    return reply
+
+
+# -----------------------------
+# 12. Main Assistant Loop (console / PyCharm)
 # -----------------------------
 def main():
     global VOICE_ENABLED
@@ -387,6 +646,7 @@ def main():
         # Exit commands
         if any(word in user_text for word in ["exit", "quit", "bye"]):
             speak("Goodbye.", force=True)
+            print(local_answer_report())
             break
 
         # Voice control: mute / unmute
@@ -400,100 +660,7 @@ def main():
             speak("I am back. I will speak again.", force=True)
             continue
 
-        # Time and date
-        if "time" in user_text:
-            speak(f"The time is {get_time_string()}.")
-            continue
-
-        if "date" in user_text or "today's date" in user_text:
-            speak(f"Today is {get_date_string()}.")
-            continue
-
-        # Open websites
-        if "open google" in user_text:
-            speak("Opening Google.")
-            webbrowser.open("https://www.google.com")
-            continue
-
-        if "open youtube" in user_text:
-            speak("Opening YouTube.")
-            webbrowser.open("https://www.youtube.com")
-            continue
-
-        if "open stackoverflow" in user_text or "open stack overflow" in user_text:
-            speak("Opening Stack Overflow.")
-            webbrowser.open("https://stackoverflow.com")
-            continue
-
-        #  Google search with proper query
-        if "search google for" in user_text or "google" in user_text:
-            if "search google for" in user_text:
-                query = user_text.split("search google for", 1)[1].strip()
-            else:
-                parts = user_text.split("google", 1)
-                query = parts[1].strip() if len(parts) > 1 else ""
-
-            if not query:
-                speak("What should I search on Google?")
-                query = takeCommand()
-
-            if query:
-                encoded = urllib.parse.quote_plus(query)
-                url = f"https://www.google.com/search?q={encoded}"
-                speak(f"Searching Google for {query}")
-                webbrowser.open(url)
-            else:
-                speak("I did not get the search term.")
-            continue
-
-        # Weather
-        if "weather" in user_text:
-            location = None
-            if " in " in user_text:
-                location = user_text.split(" in ", 1)[1].strip()
-            if not location:
-                speak("Which location? You can say just a city or a state, like Bangalore or Karnataka.")
-                location = takeCommand()
-
-            if location:
-                speak(get_live_weather(location))
-            else:
-                speak("I did not catch the location.")
-            continue
-
-        # Wikipedia
-        if user_text.startswith("wikipedia") or user_text.startswith("wiki "):
-            topic = (
-                user_text.replace("wikipedia", "", 1)
-                .replace("wiki", "", 1)
-                .strip()
-            )
-            if not topic:
-                speak("What should I search on Wikipedia?")
-                topic = takeCommand()
-
-            if topic:
-                speak(get_wikipedia_summary(topic))
-            else:
-                speak("I did not catch the topic.")
-            continue
-
-        # Custom commands: notes, reminders, photos
-        if "write a note" in user_text or "take a note" in user_text or "make a note" in user_text:
-            write_note()
-            continue
-
-        if "set a reminder" in user_text or "remind me" in user_text:
-            set_reminder()
-            continue
-
-        if "take a photo" in user_text or "take a picture" in user_text or "click a photo" in user_text:
-            take_photo()
-            continue
-
-        # General Groq AI
-        reply = ask_groq(user_text)
-        speak(reply)
+        handle_command(user_text)
         time.sleep(0.2)
 
 
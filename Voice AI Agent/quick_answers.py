@@ -0,0 +1,365 @@
+"""
+Local quick answers for Anakin.
+
+Handles commands that don't need the network or the LLM:
+    - arithmetic:        "what is 15 percent of 240", "12 times 7 plus 3"
+    - unit conversions:  "convert 10 miles to km", "100 fahrenheit in celsius"
+    - world clock:       "what time is it in london"
+
+quick_answer() returns a reply string, or None if the command isn't one of
+these, so the caller can fall through to the normal handlers.
+"""
+
+import ast
+import datetime as dt
+import functools
+import math
+import operator
+import re
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+
+
+# -----------------------------
+# 1. Helpers
+# -----------------------------
+_PREFIXES = (
+    "hey anakin", "anakin", "what is", "what's", "whats", "how much is",
+    "calculate", "compute", "convert", "tell me", "please", "the",
+)
+
+
+def _strip_prefixes(text: str) -> str:
+    """Drop filler words like "what is" / "convert" from the front."""
+    text = text.lower().strip().rstrip("?.! ").replace(",", "")
+    changed = True
+    while changed:
+        changed = False
+        for prefix in _PREFIXES:
+            if text.startswith(prefix + " "):
+                text = text[len(prefix):].strip()
+                changed = True
+    return text
+
+
+def _format_number(value: float, digits: int = 6) -> str:
+    """
+    Speakable number rounded to `digits` significant figures.
+
+    Integers are said without a decimal point, and very large or very small
+    values as "2.5 times 10 to the power of -7" instead of collapsing to 0.
+    """
+    if value == int(value) and abs(value) <= MAX_RESULT:
+        return str(int(value))
+
+    text = f"{value:.{digits}g}"
+    if "e" in text:
+        mantissa, exponent = text.split("e")
+        return f"{mantissa} times 10 to the power of {int(exponent)}"
+    return text
+
+
+# -----------------------------
+# 2. Safe arithmetic
+# -----------------------------
+_WORD_OPERATORS = [
+    (r"(\d+(?:\.\d+)?) ?(?:percent|%) of", r"(\1 / 100) *"),
+    (r"square root of (\d+(?:\.\d+)?)", r"(\1 ** 0.5)"),
+    (r"(\d+(?:\.\d+)?) squared", r"(\1 ** 2)"),
+    (r"(\d+(?:\.\d+)?) cubed", r"(\1 ** 3)"),
+    (r"to the power of", "**"),
+    (r"multiplied by", "*"),
+    (r"divided by", "/"),
+    (r"\bplus\b", "+"),
+    (r"\bminus\b", "-"),
+    (r"\btimes\b", "*"),
+    (r"\bmod(?:ulo)?\b", "%"),
+    (r"(?<=\d) ?x ?(?=\d)", " * "),
+]
+_WORD_OPERATORS = [(re.compile(pattern), repl) for pattern, repl in _WORD_OPERATORS]
+_MATH_CHARS = re.compile(r"^[\d\s.+\-*/%()]+$")
+_HAS_OPERATOR = re.compile(r"\d\s*[-+*/%]|\*\*")
+# "9/11" or "2024-10-18" are dates and names, not sums: need spaces around / and -
+_DATE_LIKE = re.compile(r"\d[/-]\d")
+MAX_EXPRESSION_LENGTH = 200  # longer input is not a spoken calculation
+
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+MAX_EXPONENT = 100
+MAX_RESULT = 1e15  # larger numbers can't be spoken sensibly (or even printed)
+
+
+class NumberTooLarge(ValueError):
+    """Raised when an intermediate or final result is beyond MAX_RESULT."""
+
+
+def _check_result(value):
+    """Reject complex, infinite or huge results before they are used again."""
+    if not isinstance(value, (int, float)):
+        raise ValueError(f"not a real number: {value!r}")
+    if isinstance(value, float) and not math.isfinite(value):
+        raise NumberTooLarge("result is not finite")
+    if abs(value) > MAX_RESULT:
+        raise NumberTooLarge("result is too large")
+    return value
+
+
+def _eval_node(node):
+    """Evaluate a parsed expression allowing only numbers and arithmetic."""
+    if isinstance(node, ast.Expression):
+        return _eval_node(node.body)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_eval_node(node.operand))
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        left = _eval_node(node.left)
+        right = _eval_node(node.right)
+        if isinstance(node.op, ast.Pow):
+            if abs(right) > MAX_EXPONENT:
+                raise ValueError("exponent too large")
+            # Don't even compute powers that would end up beyond MAX_RESULT
+            if abs(left) > 1 and right > 0 and right * math.log10(abs(left)) > math.log10(MAX_RESULT):
+                raise NumberTooLarge("power is too large")
+        return _check_result(_BIN_OPS[type(node.op)](left, right))
+    raise ValueError(f"unsupported expression: {ast.dump(node)}")
+
+
+def evaluate_expression(text: str) -> Optional[str]:
+    """Answer spoken arithmetic, or None if the text isn't a calculation."""
+    expr = _strip_prefixes(text)
+    if len(expr) > MAX_EXPRESSION_LENGTH or _DATE_LIKE.search(expr):
+        return None
+    for pattern, repl in _WORD_OPERATORS:
+        expr = pattern.sub(repl, expr)
+
+    if not _MATH_CHARS.match(expr) or not _HAS_OPERATOR.search(expr):
+        return None
+
+    try:
+        value = _check_result(_eval_node(ast.parse(expr, mode="eval")))
+        answer = _format_number(value)
+    except ZeroDivisionError:
+        return "You cannot divide by zero."
+    except NumberTooLarge:
+        return "That number is too large."
+    except (SyntaxError, ValueError, OverflowError, TypeError, RecursionError, MemoryError):
+        return None
+
+    return f"The answer is {answer}."
+
+
+# -----------------------------
+# 3. Unit conversions
+# -----------------------------
+# unit -> (dimension, factor to the base unit, spoken name, aliases)
+UNITS = {
+    # length (base: meter)
+    "mm": ("length", 0.001, "millimeters", ["millimeter", "millimeters", "millimetre", "millimetres"]),
+    "cm": ("length", 0.01, "centimeters", ["centimeter", "centimeters", "centimetre", "centimetres"]),
+    "m": ("length", 1.0, "meters", ["meter", "meters", "metre", "metres"]),
+    "km": ("length", 1000.0, "kilometers", ["kms", "kilometer", "kilometers", "kilometre", "kilometres"]),
+    "in": ("length", 0.0254, "inches", ["inch", "inches"]),
+    "ft": ("length", 0.3048, "feet", ["foot", "feet"]),
+    "yd": ("length", 0.9144, "yards", ["yard", "yards"]),
+    "mi": ("length", 1609.344, "miles", ["mile", "miles"]),
+    # mass (base: kilogram)
+    "mg": ("mass", 1e-6, "milligrams", ["milligram", "milligrams"]),
+    "g": ("mass", 0.001, "grams", ["gram", "grams"]),
+    "kg": ("mass", 1.0, "kilograms", ["kgs", "kilo", "kilos", "kilogram", "kilograms"]),
+    "t": ("mass", 1000.0, "tonnes", ["ton", "tons", "tonne", "tonnes"]),
+    "lb": ("mass", 0.45359237, "pounds", ["lbs", "pound", "pounds"]),
+    "oz": ("mass", 0.028349523125, "ounces", ["ounce", "ounces"]),
+    # volume (base: liter)
+    "ml": ("volume", 0.001, "milliliters", ["milliliter", "milliliters", "millilitre", "millilitres"]),
+    "l": ("volume", 1.0, "liters", ["liter", "liters", "litre", "litres"]),
+    "gal": ("volume", 3.785411784, "gallons", ["gallon", "gallons"]),
+    "cup": ("volume", 0.2365882365, "cups", ["cups"]),
+    # speed (base: meters per second)
+    "m/s": ("speed", 1.0, "meters per second", ["meters per second", "metres per second"]),
+    "km/h": ("speed", 1 / 3.6, "kilometers per hour", ["kmph", "kph", "kilometers per hour", "kilometres per hour"]),
+    "mph": ("speed", 0.44704, "miles per hour", ["miles per hour"]),
+    # temperature (converted separately, factors unused)
+    "c": ("temperature", None, "degrees Celsius", ["celsius", "centigrade"]),
+    "f": ("temperature", None, "degrees Fahrenheit", ["fahrenheit"]),
+    "k": ("temperature", None, "kelvin", ["kelvin", "kelvins"]),
+}
+
+# Spoken name for exactly one unit, where it isn't the plural minus "s"
+_SINGULAR_NAMES = {
+    "in": "inch",
+    "ft": "foot",
+    "m/s": "meter per second",
+    "km/h": "kilometer per hour",
+    "mph": "mile per hour",
+    "c": "degree Celsius",
+    "f": "degree Fahrenheit",
+}
+
+_UNIT_ALIASES = {}
+for _key, (_dim, _factor, _name, _aliases) in UNITS.items():
+    _UNIT_ALIASES[_key] = _key
+    for _alias in _aliases:
+        _UNIT_ALIASES[_alias] = _key
+
+_CONVERSION = re.compile(
+    r"^(-?\d+(?:\.\d+)?) ?(?:degrees? )?([a-z/ ]+?) (?:to|in|into) (?:degrees? )?([a-z/ ]+)$"
+)
+
+
+def _to_celsius(value: float, unit: str) -> float:
+    if unit == "f":
+        return (value - 32) * 5 / 9
+    if unit == "k":
+        return value - 273.15
+    return value
+
+
+def _from_celsius(value: float, unit: str) -> float:
+    if unit == "f":
+        return value * 9 / 5 + 32
+    if unit == "k":
+        return value + 273.15
+    return value
+
+
+def _unit_name(unit: str, spoken_value: str) -> str:
+    """Plural unit name, or the singular one for "1"."""
+    name = UNITS[unit][2]
+    if spoken_value not in ("1", "-1"):
+        return name
+    return _SINGULAR_NAMES.get(unit, name[:-1] if name.endswith("s") else name)
+
+
+def convert_units(text: str) -> Optional[str]:
+    """Answer "convert 10 miles to km" style requests, or None."""
+    match = _CONVERSION.match(_strip_prefixes(text))
+    if not match:
+        return None
+
+    value = float(match.group(1))
+    src = _UNIT_ALIASES.get(match.group(2).strip())
+    dst = _UNIT_ALIASES.get(match.group(3).strip())
+    if src is None or dst is None:
+        return None
+
+    if not math.isfinite(value):
+        return "That number is too large."
+
+    src_dim, src_factor, src_name, _ = UNITS[src]
+    dst_dim, dst_factor, dst_name, _ = UNITS[dst]
+    if src_dim != dst_dim:
+        return f"I cannot convert {src_name} to {dst_name}."
+
+    if src_dim == "temperature":
+        result = _from_celsius(_to_celsius(value, src), dst)
+    else:
+        result = value * src_factor / dst_factor
+
+    if not math.isfinite(result):
+        return "That number is too large."
+
+    spoken_value = _format_number(value)
+    spoken_result = _format_number(result, digits=4)
+    return (
+        f"{spoken_value} {_unit_name(src, spoken_value)} is "
+        f"{spoken_result} {_unit_name(dst, spoken_result)}."
+    )
+
+
+# -----------------------------
+# 4. World clock (zoneinfo)
+# -----------------------------
+# Places people ask for that aren't the last part of an IANA zone name
+CITY_TIMEZONES = {
+    "india": "Asia/Kolkata",
+    "delhi": "Asia/Kolkata",
+    "new delhi": "Asia/Kolkata",
+    "mumbai": "Asia/Kolkata",
+    "bangalore": "Asia/Kolkata",
+    "bengaluru": "Asia/Kolkata",
+    "chennai": "Asia/Kolkata",
+    "hyderabad": "Asia/Kolkata",
+    "uk": "Europe/London",
+    "england": "Europe/London",
+    "usa": "America/New_York",
+    "america": "America/New_York",
+    "washington": "America/New_York",
+    "boston": "America/New_York",
+    "san francisco": "America/Los_Angeles",
+    "seattle": "America/Los_Angeles",
+    "california": "America/Los_Angeles",
+    "texas": "America/Chicago",
+    "japan": "Asia/Tokyo",
+    "china": "Asia/Shanghai",
+    "beijing": "Asia/Shanghai",
+    "germany": "Europe/Berlin",
+    "france": "Europe/Paris",
+    "australia": "Australia/Sydney",
+    "uae": "Asia/Dubai",
+    "canada": "America/Toronto",
+}
+
+_WORLD_CLOCK = re.compile(
+    r"^(?:what(?:'s| is)? )?(?:the )?(?:current |local )?time (?:is it )?(?:now |right now )?in ([a-z][a-z .'-]*?)(?: right now| now)?$"
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _zone_index() -> dict:
+    """Map "new york" -> "America/New_York" for every zone on this system (built once)."""
+    index = {}
+    for zone in available_timezones():
+        place = zone.rsplit("/", 1)[-1].replace("_", " ").lower()
+        index.setdefault(place, zone)
+    return index
+
+
+def find_timezone(place: str) -> Optional[str]:
+    """Return the IANA zone name for a spoken place, or None if unknown."""
+    place = place.strip().lower()
+    if place.startswith("the "):
+        place = place[4:]
+    return CITY_TIMEZONES.get(place) or _zone_index().get(place)
+
+
+def world_time(text: str) -> Optional[str]:
+    """Answer "what time is it in london", or None."""
+    match = _WORLD_CLOCK.match(text.lower().strip().rstrip("?.! "))
+    if not match:
+        return None
+
+    place = match.group(1).strip()
+    zone = find_timezone(place)
+    if zone is None:
+        return None  # let the local-time branch or the LLM handle it
+
+    try:
+        now = dt.datetime.now(ZoneInfo(zone))
+    except ZoneInfoNotFoundError:
+        return None
+
+    reply = f"The time in {place.title()} is {now.strftime('%I:%M %p')}"
+    if now.date() != dt.datetime.now().date():
+        reply += f", {now.strftime('%A')}"
+    return reply + "."
+
+
+# -----------------------------
+# 5. Entry point
+# -----------------------------
+def quick_answer(text: str) -> Optional[str]:
+    """Try every local answerer in turn; None means "ask someone else"."""
+    for answerer in (world_time, convert_units, evaluate_expression):
+        reply = answerer(text)
+        if reply is not None:
+            return reply
+    return None